@@ -1,16 +1,38 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, colorchooser, messagebox, simpledialog
-import copy
+import io
 import math
+import time
+import hashlib
+from contextlib import contextmanager
+from array import array
+from bisect import bisect_left, insort
+from types import MappingProxyType
 
 # Attempt Pillow import for image support
 try:
-    from PIL import Image, ImageTk, ImageDraw, ImageFont
+    from PIL import Image, ImageTk, ImageDraw, ImageFont, EpsImagePlugin
     PIL_AVAILABLE = True
+    # Lossless transposes for counter-clockwise quarter turns (same direction as Image.rotate)
+    QUARTER_TURN_TRANSPOSE = {1: Image.ROTATE_90, 2: Image.ROTATE_180, 3: Image.ROTATE_270}
 except ImportError:
     PIL_AVAILABLE = False
     print("Warning: Pillow (PIL) not installed. Some features may fail.")
 
+# Attempt NumPy import to vectorize the numeric drag kernels (optional speedup)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Attempt Numba import to JIT-compile the numeric drag kernels (optional speedup)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # ------------------------------------------------------------------------------
 # GLOBAL CONSTANTS
 # ------------------------------------------------------------------------------
@@ -27,9 +49,18 @@ SOFT_ERASER_FADE_STEP = 20
 BEND_RADIUS_A = 60.0   # Tool A: push/anchor-drag bending
 BEND_RADIUS_B = 50.0   # Tool B: arc-based bending
 
+# Minimum interval (ms) between canvas updates while dragging (~60 Hz)
+DRAG_FRAME_MS = 16
+
 # Threshold (pixels) for auto-connecting endpoints
 CONNECT_THRESHOLD = 10
 
+# Cell size (pixels) of the uniform grid used to index shape bounding boxes
+SPATIAL_CELL_SIZE = 64
+
+# Element type of the flat coordinate arrays kept for line/brush/bending_line shapes
+STROKE_COORD_TYPECODE = 'd'   # float64: exact canvas coordinates, no rounding drift
+
 # ------------------------------------------------------------------------------
 # HELPER FUNCTION: Apply opacity (simulate transparency by blending with white)
 # ------------------------------------------------------------------------------
@@ -46,6 +77,197 @@ def apply_opacity(color, opacity):
     new_b = int(opacity * b + (1 - opacity) * 255)
     return f"#{new_r:02x}{new_g:02x}{new_b:02x}"
 
+# ------------------------------------------------------------------------------
+# HELPER FUNCTION: Fade a color one soft-eraser step toward white
+# ------------------------------------------------------------------------------
+# Channel value after one fade step (the target is always white, so never past 255)
+_FADE_LUT = bytes(min(255, c + SOFT_ERASER_FADE_STEP) for c in range(256))
+
+def fade_color(color):
+    if not color or len(color) != 7:
+        return color
+    # color is expected in "#RRGGBB" format
+    v = int(color[1:], 16)
+    r = _FADE_LUT[v >> 16]
+    g = _FADE_LUT[(v >> 8) & 0xFF]
+    b = _FADE_LUT[v & 0xFF]
+    return f"#{(r << 16) | (g << 8) | b:06x}"
+
+# ------------------------------------------------------------------------------
+# NUMERIC KERNELS (pure loops over flat [x0, y0, x1, y1, ...] coords, no Tk calls)
+# ------------------------------------------------------------------------------
+def _apply_bend_falloff(coords, cx, cy, dx, dy, radius):
+    """Push points within radius of (cx, cy) by (dx, dy), fading linearly to zero at the edge."""
+    r2 = radius * radius
+    inv_r = 1.0 / radius
+    for i in range(0, len(coords), 2):
+        px = coords[i] - cx
+        py = coords[i + 1] - cy
+        d2 = px * px + py * py
+        if d2 < r2:
+            # Only points inside the radius need the actual distance
+            f = 1.0 - math.sqrt(d2) * inv_r
+            coords[i] += dx * f
+            coords[i + 1] += dy * f
+    return coords
+
+def _apply_bend_falloff_np(xy, cx, cy, dx, dy, radius):
+    """Vectorized _apply_bend_falloff on an (N, 2) view of the coords; writes through the view."""
+    px = xy[:, 0] - cx
+    py = xy[:, 1] - cy
+    d2 = px * px + py * py
+    mask = d2 < radius * radius
+    f = 1.0 - np.sqrt(d2[mask]) * (1.0 / radius)
+    xy[mask] += np.multiply.outer(f, (dx, dy))
+
+def _closest_segment(coords, mx, my):
+    """
+    Scalar closest-segment scan over flat coords with the point-to-segment
+    distance written out inline; this is the pure-Python fallback and also
+    compiles under Numba. The x/y slices are walked with zip rather than by
+    indexing four coords per segment.
+    A segment whose endpoints both lie on one side of the point, each at least
+    the best distance away along x or y, is skipped before the projection.
+    Returns (flat start index, squared distance); index -1 if there is no segment.
+    """
+    xs = coords[0::2]
+    ys = coords[1::2]
+    best_i = -1
+    best_d2 = -1.0
+    for i, (x1, y1, x2, y2) in enumerate(zip(xs, ys, xs[1:], ys[1:])):
+        wx = mx - x1
+        wy = my - y1
+        vx = mx - x2
+        vy = my - y2
+        if best_i >= 0 and (
+                (wx * vx > 0 and wx * wx >= best_d2 and vx * vx >= best_d2)
+                or (wy * vy > 0 and wy * wy >= best_d2 and vy * vy >= best_d2)):
+            continue
+        sx = x2 - x1
+        sy = y2 - y1
+        seg_len_sq = sx * sx + sy * sy
+        t = 0.0
+        if seg_len_sq != 0:
+            t = (wx * sx + wy * sy) / seg_len_sq
+            t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+        ex = wx - t * sx
+        ey = wy - t * sy
+        d2 = ex * ex + ey * ey
+        if best_i < 0 or d2 < best_d2:
+            best_i = 2 * i
+            best_d2 = d2
+    return best_i, best_d2
+
+def _closest_segment_np(xs, ys, mx, my):
+    """Flat start index of the segment closest to (mx, my), in one vectorized pass over x/y lanes."""
+    x1 = xs[:-1]
+    y1 = ys[:-1]
+    sx = xs[1:] - x1
+    sy = ys[1:] - y1
+    seg_len_sq = sx * sx + sy * sy
+    wx = mx - x1
+    wy = my - y1
+    # Zero-length segments get t = 0, i.e. the distance to their start point
+    t = (wx * sx + wy * sy) / np.where(seg_len_sq == 0, 1.0, seg_len_sq)
+    np.clip(t, 0.0, 1.0, out=t)
+    ex = wx - t * sx
+    ey = wy - t * sy
+    return int((ex * ex + ey * ey).argmin()) * 2
+
+def _compact_outside_radius(coords, ex, ey, radius):
+    """Move points at least radius away from (ex, ey) to the front; returns the kept length."""
+    r2 = radius * radius
+    n = 0
+    for i in range(0, len(coords), 2):
+        px = coords[i] - ex
+        py = coords[i + 1] - ey
+        if px * px + py * py >= r2:
+            coords[n] = coords[i]
+            coords[n + 1] = coords[i + 1]
+            n += 2
+    return n
+
+def _arc_interpolation(coords, start_idx, end_idx):
+    """Re-space the points between two anchors along a shallow sine arc."""
+    x1, y1 = coords[start_idx], coords[start_idx + 1]
+    x2, y2 = coords[end_idx], coords[end_idx + 1]
+    num_points = (end_idx - start_idx) // 2 - 1
+    if num_points <= 0:
+        return
+    # The chord and its unit normal are the same for every interior point
+    dx = x2 - x1
+    dy = y2 - y1
+    length = math.hypot(dx, dy)
+    inv_len = 1.0 / length if length != 0 else 0.0
+    perp_dx = -dy * inv_len
+    perp_dy = dx * inv_len
+    inv_n = 1.0 / (num_points + 1)
+    for i in range(1, num_points + 1):
+        t = i * inv_n
+        xi = (1 - t) * x1 + t * x2
+        yi = (1 - t) * y1 + t * y2
+        offset = 10 * math.sin(math.pi * t) if length != 0 else 0
+        new_x = xi + offset * perp_dx
+        new_y = yi + offset * perp_dy
+        idx = start_idx + 2 * i
+        coords[idx] = new_x
+        coords[idx + 1] = new_y
+
+def _linear_interpolation(coords, start_idx, end_idx):
+    """Re-space the points between two anchors evenly on the straight segment."""
+    if end_idx < start_idx:
+        start_idx, end_idx = end_idx, start_idx
+    x1, y1 = coords[start_idx], coords[start_idx + 1]
+    x2, y2 = coords[end_idx], coords[end_idx + 1]
+    num_points = (end_idx - start_idx) // 2 - 1
+    if num_points <= 0:
+        return
+    inv_n = 1.0 / (num_points + 1)
+    for i in range(1, num_points + 1):
+        t = i * inv_n
+        xi = (1 - t) * x1 + t * x2
+        yi = (1 - t) * y1 + t * y2
+        idx = start_idx + 2 * i
+        coords[idx] = xi
+        coords[idx + 1] = yi
+
+def _reverse_points(coords):
+    """Return a copy of flat coords with the point order reversed (x/y pairs kept intact)."""
+    out = coords[:]
+    out[0::2] = coords[-2::-2]
+    out[1::2] = coords[-1::-2]
+    return out
+
+# ------------------------------------------------------------------------------
+# SNAPSHOT HELPERS (shape dicts only hold primitives and flat lists/arrays/dicts)
+# ------------------------------------------------------------------------------
+def _clone_shape(shape):
+    # Read-only mappings (text_props) are immutable leaves and are shared, not copied
+    return {k: (v[:] if isinstance(v, (list, array)) else dict(v) if isinstance(v, dict) else v)
+            for k, v in shape.items()}
+
+def _clone_shapes(shapes):
+    """Schema-aware replacement for copy.deepcopy on ShapeData.shapes."""
+    return {iid: _clone_shape(shape) for iid, shape in shapes.items()}
+
+if NUMBA_AVAILABLE:
+    # Same bodies compiled for NumPy arrays; cache=True keeps the machine code on disk
+    _apply_bend_falloff_jit = njit(cache=True, fastmath=True)(_apply_bend_falloff)
+    _compact_outside_radius_jit = njit(cache=True, fastmath=True)(_compact_outside_radius)
+    _arc_interpolation_jit = njit(cache=True, fastmath=True)(_arc_interpolation)
+    _linear_interpolation_jit = njit(cache=True, fastmath=True)(_linear_interpolation)
+    _closest_segment_jit = njit(cache=True, fastmath=True)(_closest_segment)
+
+    def _numba_warmup():
+        """Compile (or load from the disk cache) each kernel for the argument types
+        used at runtime, so the first stroke doesn't stall on JIT compilation."""
+        coords = np.zeros(8, dtype=STROKE_COORD_TYPECODE)
+        _apply_bend_falloff_jit(coords, 0.0, 0.0, 0.0, 0.0, 1.0)
+        _compact_outside_radius_jit(np.zeros(8), 0.0, 0.0, 1.0)
+        _arc_interpolation_jit(coords, 0, 6)
+        _linear_interpolation_jit(coords, 0, 6)
+        _closest_segment_jit(coords, 0.0, 0.0)
+
 # ------------------------------------------------------------------------------
 # RECOLOR DIALOG CLASS
 # ------------------------------------------------------------------------------
@@ -78,41 +300,90 @@ class RecolorDialog(simpledialog.Dialog):
 # ------------------------------------------------------------------------------
 # TEXT EDITOR DIALOG CLASS
 # ------------------------------------------------------------------------------
-class TextEditorDialog(simpledialog.Dialog):
-    def __init__(self, parent, title="Edit Text", initial_props=None):
-        self.initial_props = initial_props or {
-            "text": "",
-            "font": "Arial",
-            "font_size": DEFAULT_FONT_SIZE,
-            "fill": DEFAULT_STROKE_COLOR
-        }
-        super().__init__(parent, title)
-
-    def body(self, master):
+class TextEditorDialog(tk.Toplevel):
+    """
+    Modal editor for text properties. The editor builds it once and keeps it
+    withdrawn between uses, so later edits only reset the field values
+    instead of recreating the widgets and variables.
+    """
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.withdraw()
+        self.transient(parent)
+        self.resizable(False, False)
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+        self.result = None
+        self.done_var = tk.BooleanVar(self, value=False)
+
+        master = tk.Frame(self)
+        master.pack(padx=5, pady=5)
         tk.Label(master, text="Text:").grid(row=0, column=0, sticky="w")
-        self.text_var = tk.StringVar(value=self.initial_props["text"])
-        tk.Entry(master, textvariable=self.text_var, width=40).grid(row=0, column=1)
-        
+        self.text_var = tk.StringVar(self)
+        self.text_entry = tk.Entry(master, textvariable=self.text_var, width=40)
+        self.text_entry.grid(row=0, column=1)
+
         tk.Label(master, text="Font:").grid(row=1, column=0, sticky="w")
-        self.font_var = tk.StringVar(value=self.initial_props["font"])
+        self.font_var = tk.StringVar(self)
         tk.Entry(master, textvariable=self.font_var).grid(row=1, column=1)
-        
+
         tk.Label(master, text="Font Size:").grid(row=2, column=0, sticky="w")
-        self.size_var = tk.IntVar(value=self.initial_props["font_size"])
+        self.size_var = tk.IntVar(self)
         tk.Entry(master, textvariable=self.size_var).grid(row=2, column=1)
-        
+
         tk.Label(master, text="Fill Color:").grid(row=3, column=0, sticky="w")
-        self.fill_var = tk.StringVar(value=self.initial_props["fill"])
+        self.fill_var = tk.StringVar(self)
         tk.Entry(master, textvariable=self.fill_var).grid(row=3, column=1)
-        return master
 
-    def apply(self):
+        box = tk.Frame(self)
+        box.pack(pady=5)
+        tk.Button(box, text="OK", width=10, command=self.ok, default=tk.ACTIVE).pack(side=tk.LEFT, padx=5)
+        tk.Button(box, text="Cancel", width=10, command=self.cancel).pack(side=tk.LEFT, padx=5)
+        self.bind("<Return>", self.ok)
+        self.bind("<Escape>", self.cancel)
+
+    def ask(self, title, initial_props=None):
+        """Shows the dialog modally and returns the entered props, or None if cancelled."""
+        props = initial_props or {
+            "text": "",
+            "font": "Arial",
+            "font_size": DEFAULT_FONT_SIZE,
+            "fill": DEFAULT_STROKE_COLOR
+        }
+        self.title(title)
+        self.text_var.set(props["text"])
+        self.font_var.set(props["font"])
+        self.size_var.set(props["font_size"])
+        self.fill_var.set(props["fill"])
+        self.result = None
+        self.done_var.set(False)
+        parent = self.master
+        self.geometry(f"+{parent.winfo_rootx() + 50}+{parent.winfo_rooty() + 50}")
+        self.deiconify()
+        self.wait_visibility()
+        self.grab_set()
+        self.text_entry.focus_set()
+        self.wait_variable(self.done_var)
+        self.grab_release()
+        self.withdraw()
+        return self.result
+
+    def ok(self, event=None):
+        try:
+            font_size = self.size_var.get()
+        except tk.TclError:
+            messagebox.showwarning("Illegal value", "Font size must be an integer.", parent=self)
+            return
         self.result = {
             "text": self.text_var.get(),
             "font": self.font_var.get(),
-            "font_size": self.size_var.get(),
+            "font_size": font_size,
             "fill": self.fill_var.get()
         }
+        self.done_var.set(True)
+
+    def cancel(self, event=None):
+        self.result = None
+        self.done_var.set(True)
 
 # ------------------------------------------------------------------------------
 # LAYER CLASS
@@ -120,19 +391,99 @@ class TextEditorDialog(simpledialog.Dialog):
 class Layer:
     """
     A layer holds a name, visibility and lock status, plus a list of items.
-    Each item is a tuple (canvas_item_id, shape_type).
+    Each item is a tuple (canvas_item_id, shape_type). If a registry dict is
+    given, it is kept mapping each item id to the layer that holds it.
     """
-    def __init__(self, name, visible=True, locked=False):
+    def __init__(self, name, visible=True, locked=False, registry=None):
         self.name = name
         self.visible = visible
         self.locked = locked
         self.items = []
+        self.registry = registry
 
     def add_item(self, item_id, shape_type):
         self.items.append((item_id, shape_type))
+        if self.registry is not None:
+            self.registry[item_id] = self
 
     def remove_item(self, item_id):
         self.items = [(iid, s) for (iid, s) in self.items if iid != item_id]
+        if self.registry is not None:
+            self.registry.pop(item_id, None)
+
+    def remove_items(self, item_ids):
+        """Removes every id in the given set with a single pass over the item list."""
+        self.items = [(iid, s) for (iid, s) in self.items if iid not in item_ids]
+        if self.registry is not None:
+            for iid in item_ids:
+                if self.registry.get(iid) is self:
+                    del self.registry[iid]
+
+# ------------------------------------------------------------------------------
+# SPATIAL INDEX CLASS
+# ------------------------------------------------------------------------------
+class SpatialIndex:
+    """
+    Uniform grid over item bounding boxes. Each item is listed in every cell
+    its bbox touches, so a region query only visits the cells it covers
+    instead of every item on the canvas.
+    """
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.bboxes = {}
+
+    def _cells_for(self, bbox):
+        cs = self.cell_size
+        x1, y1, x2, y2 = bbox
+        for cx in range(int(x1 // cs), int(x2 // cs) + 1):
+            for cy in range(int(y1 // cs), int(y2 // cs) + 1):
+                yield (cx, cy)
+
+    def insert(self, item_id, bbox):
+        self.delete(item_id)
+        self.bboxes[item_id] = bbox
+        for cell in self._cells_for(bbox):
+            self.cells.setdefault(cell, set()).add(item_id)
+
+    def delete(self, item_id):
+        bbox = self.bboxes.pop(item_id, None)
+        if bbox is None:
+            return
+        for cell in self._cells_for(bbox):
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                bucket.discard(item_id)
+                if not bucket:
+                    del self.cells[cell]
+
+    def intersection(self, bbox):
+        """Returns the ids whose bounding box overlaps bbox (x1, y1, x2, y2)."""
+        found = set()
+        for cell in self._cells_for(bbox):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found |= bucket
+        x1, y1, x2, y2 = bbox
+        hits = []
+        for iid in found:
+            bx1, by1, bx2, by2 = self.bboxes[iid]
+            if bx1 <= x2 and x1 <= bx2 and by1 <= y2 and y1 <= by2:
+                hits.append(iid)
+        return hits
+
+    def overlaps(self, item_id, bbox):
+        """True if the item's indexed bbox overlaps bbox (False for unknown items)."""
+        item_bbox = self.bboxes.get(item_id)
+        if item_bbox is None:
+            return False
+        bx1, by1, bx2, by2 = item_bbox
+        x1, y1, x2, y2 = bbox
+        return bx1 <= x2 and x1 <= bx2 and by1 <= y2 and y1 <= by2
+
+    def clear(self):
+        self.cells.clear()
+        self.bboxes.clear()
 
 # ------------------------------------------------------------------------------
 # SHAPE DATA CLASS
@@ -140,14 +491,39 @@ class Layer:
 class ShapeData:
     """
     Stores data for each drawn shape.
+    Line, brush and bending-line coords are kept as a flat float64 array
+    (x0, y0, x1, y1, ...) instead of a list of boxed Python floats.
+    Every shape's bounding box is mirrored in a SpatialIndex for region queries,
+    and ids stored or moved since the last history push are kept in `dirty`.
+    Stroke widths are also mirrored flat in `base_width` for selection styling.
     """
     def __init__(self):
         self.shapes = {}
+        self.index = SpatialIndex()
+        self.dirty = set()
+        self.base_width = {}
+
+    @staticmethod
+    def copy_coords(shape_type, coords):
+        if shape_type in ("line", "brush", "bending_line"):
+            return array(STROKE_COORD_TYPECODE, coords)
+        return coords[:]
+
+    @staticmethod
+    def bbox_of(shape):
+        coords = shape['coords']
+        xs = coords[0::2]
+        ys = coords[1::2]
+        pad = (shape['width'] or 0) / 2
+        return (min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad)
+
+    def reindex(self, item_id):
+        self.index.insert(item_id, self.bbox_of(self.shapes[item_id]))
 
     def store(self, item_id, shape_type, coords, fill, outline, width):
         self.shapes[item_id] = {
             'type': shape_type,
-            'coords': coords[:],
+            'coords': self.copy_coords(shape_type, coords),
             'fill': fill,
             'outline': outline,
             'width': width,
@@ -157,17 +533,58 @@ class ShapeData:
             self.shapes[item_id]['anchors'] = []
         if shape_type == "group":
             self.shapes[item_id]['children'] = []
+        self.base_width[item_id] = width
+        self.reindex(item_id)
+        self.dirty.add(item_id)
+
+    def restore(self, item_id, shape):
+        """
+        Re-registers a shape dict taken from a history snapshot. Snapshots are
+        taken before auto-connect runs, so restored shapes count as dirty and
+        get matched again on the next history push.
+        """
+        self.shapes[item_id] = shape
+        self.base_width[item_id] = shape['width']
+        self.reindex(item_id)
+        self.dirty.add(item_id)
+
+    def append_point(self, item_id, x, y):
+        """Streams one point onto the end of a stroke's coords in place, without copying them."""
+        shape = self.shapes[item_id]
+        shape['coords'].extend((x, y))
+        x1, y1, x2, y2 = self.index.bboxes[item_id]
+        pad = (shape['width'] or 0) / 2
+        if not (x1 <= x - pad and x + pad <= x2 and y1 <= y - pad and y + pad <= y2):
+            self.index.insert(item_id, (min(x1, x - pad), min(y1, y - pad), max(x2, x + pad), max(y2, y + pad)))
+        self.dirty.add(item_id)
 
     def remove(self, item_id):
         if item_id in self.shapes:
             del self.shapes[item_id]
+            del self.base_width[item_id]
+            self.index.delete(item_id)
+            self.dirty.discard(item_id)
+
+    def clear(self):
+        self.shapes.clear()
+        self.base_width.clear()
+        self.index.clear()
+        self.dirty.clear()
+
+    def take_dirty(self):
+        """Returns the ids stored or moved since the previous call and resets the set."""
+        dirty, self.dirty = self.dirty, set()
+        return dirty
 
     def get(self, item_id):
         return self.shapes.get(item_id)
 
     def update_coords(self, item_id, new_coords):
-        if item_id in self.shapes:
-            self.shapes[item_id]['coords'] = new_coords[:]
+        shape = self.shapes.get(item_id)
+        if shape:
+            shape['coords'] = self.copy_coords(shape['type'], new_coords)
+            self.reindex(item_id)
+            self.dirty.add(item_id)
 
 # ------------------------------------------------------------------------------
 # EDITOR HISTORY CLASS
@@ -175,22 +592,41 @@ class ShapeData:
 class EditorHistory:
     """
     Simple linear history for undo/redo.
+    `image_refs` counts how many states use each pooled image digest; digests
+    whose last state was truncated or evicted are collected in `released`.
     """
     def __init__(self):
         self.states = []
         self.current_index = -1
+        self.image_refs = {}
+        self.released = set()
+
+    def count_images(self, shapes, step):
+        for h in {s['image_hash'] for s in shapes.values() if 'image_hash' in s}:
+            n = self.image_refs.get(h, 0) + step
+            if n:
+                self.image_refs[h] = n
+                self.released.discard(h)
+            else:
+                del self.image_refs[h]
+                self.released.add(h)
 
     def push_state(self, shape_data, layers, description):
         if self.current_index < len(self.states) - 1:
+            for shapes, _, _ in self.states[self.current_index + 1:]:
+                self.count_images(shapes, -1)
             self.states = self.states[:self.current_index + 1]
         if len(self.states) >= MAX_HISTORY:
+            self.count_images(self.states[0][0], -1)
             del self.states[0]
             self.current_index -= 1
-        shape_data_copy = copy.deepcopy(shape_data.shapes)
+        shape_data_copy = _clone_shapes(shape_data.shapes)
+        self.count_images(shape_data_copy, 1)
         layers_copy = []
         for lyr in layers:
             new_layer = Layer(lyr.name, lyr.visible, lyr.locked)
-            new_layer.items = copy.deepcopy(lyr.items)
+            # (item_id, shape_type) tuples are immutable, a shallow copy is enough
+            new_layer.items = list(lyr.items)
             layers_copy.append(new_layer)
         self.states.append((shape_data_copy, layers_copy, description))
         self.current_index = len(self.states) - 1
@@ -219,9 +655,82 @@ class EditorHistory:
             return self.states[self.current_index]
         return None
 
+    def take_released(self):
+        """Returns the image digests no state refers to anymore and resets the set."""
+        released, self.released = self.released, set()
+        return released
+
     def get_all_descriptions(self):
         return [f"{i}: {desc[2]}" for i, desc in enumerate(self.states)]
 
+# ------------------------------------------------------------------------------
+# HISTORY RESTORE FUNCTIONS (recreate one canvas item from a snapshot shape dict)
+# ------------------------------------------------------------------------------
+def _restore_line(editor, sdata):
+    return editor.canvas.create_line(*sdata['coords'], fill=sdata['outline'], width=sdata['width'],
+                                     smooth=True, splinesteps=36)
+
+def _restore_rectangle(editor, sdata):
+    return editor.canvas.create_rectangle(*sdata['coords'], outline=sdata['outline'],
+                                          fill=sdata['fill'], width=sdata['width'])
+
+def _restore_ellipse(editor, sdata):
+    return editor.canvas.create_oval(*sdata['coords'], outline=sdata['outline'],
+                                     fill=sdata['fill'], width=sdata['width'])
+
+def _restore_editable_text(editor, sdata):
+    coords = sdata['coords']
+    props = sdata.get("text_props", {})
+    new_id = editor.canvas.create_text(coords[0], coords[1],
+                                       text=props.get("text", ""),
+                                       fill=props.get("fill", editor.stroke_color),
+                                       font=(props.get("font", "Arial"), props.get("font_size", DEFAULT_FONT_SIZE)))
+    editor.canvas.tag_bind(new_id, "<Double-Button-1>", lambda event, id=new_id: editor.edit_text_item(id))
+    return new_id
+
+def _restore_text(editor, sdata):
+    coords = sdata['coords']
+    return editor.canvas.create_text(coords[0], coords[1], text="Sample", fill=sdata['outline'])
+
+def _restore_image(editor, sdata):
+    coords = sdata['coords']
+    pil_image = editor.image_pool.get(sdata.get('image_hash'))
+    if pil_image is None:
+        return editor.canvas.create_text(coords[0], coords[1],
+                                         text="(Missing image in snapshot)",
+                                         fill="red")
+    tk_image = ImageTk.PhotoImage(pil_image)
+    new_id = editor.canvas.create_image(coords[0], coords[1], anchor="nw", image=tk_image)
+    editor.image_refs[new_id] = (pil_image, tk_image)
+    return new_id
+
+def _restore_group(editor, sdata):
+    canvas = editor.canvas
+    if "children" in sdata and sdata["children"]:
+        bbs = [canvas.bbox(child) for child in sdata["children"] if canvas.bbox(child)]
+        if bbs:
+            x1 = min(bb[0] for bb in bbs)
+            y1 = min(bb[1] for bb in bbs)
+            x2 = max(bb[2] for bb in bbs)
+            y2 = max(bb[3] for bb in bbs)
+            return canvas.create_rectangle(x1, y1, x2, y2, outline="purple", dash=(4,2))
+    return canvas.create_rectangle(0, 0, 0, 0)
+
+def _restore_polyline(editor, sdata):
+    return editor.canvas.create_line(*sdata['coords'], fill=sdata['outline'], width=sdata['width'])
+
+# Shape type -> restore function; the None entry handles every other type
+_RESTORE = {
+    "line": _restore_line,
+    "rectangle": _restore_rectangle,
+    "ellipse": _restore_ellipse,
+    "editable_text": _restore_editable_text,
+    "text": _restore_text,
+    "image": _restore_image,
+    "group": _restore_group,
+    None: _restore_polyline,
+}
+
 # ------------------------------------------------------------------------------
 # MAIN EDITOR CLASS
 # ------------------------------------------------------------------------------
@@ -236,8 +745,12 @@ class SimpleImageEditor:
 
         self.shape_data = ShapeData()
         self.layers = []
+        # Reverse index: canvas item id -> Layer holding it (kept up to date by Layer)
+        self.item_layer = {}
         self.current_layer_index = None
         self.selected_items = set()
+        # Items currently drawn with the selection width bump
+        self.prev_highlight = set()
 
         self.brush_size = DEFAULT_BRUSH_SIZE
         self.stroke_color = DEFAULT_STROKE_COLOR
@@ -255,24 +768,51 @@ class SimpleImageEditor:
         self.start_y = None
         self.last_x = None
         self.last_y = None
+        # Selection marquee: one hidden rectangle, shown while marquee_active
         self.select_rect_id = None
+        self.marquee_active = False
+
+        # Coalesced <B1-Motion> position and the pending after() callback that applies it;
+        # freehand tools also keep every sample since the last flush in pending_points
+        self.pending_drag = None
+        self.pending_points = []
+        self.drag_flush_id = None
+        self.last_drag_flush = 0.0
+        # Polyline that the current brush stroke extends, and whether its second
+        # vertex is still the (x + 1, y + 1) placeholder that makes a bare click visible
+        self.brush_item = None
+        self.brush_placeholder = False
+        # batch_draw() nesting depth, and the anchor handles awaiting a redraw
+        # (shape_id -> set of coord indices, or None for all of its handles)
+        self.batch_depth = 0
+        self.anchor_redraw = {}
 
         self.bendA_active = False
         self.bendB_active = False
         self.bend_dragging = False
         self.bend_target = None
         self.bendA_dragging_anchor_idx = None
-        self.bendA_segment_idx = None
         self.bendB_dragging_anchor_idx = None
+        # (previous, next) anchor around the anchor being dragged by Bend Tool A/B
+        self.bend_neighbour_anchors = (None, None)
         self.initial_angle = None
 
         self.direct_select_dragging_anchor = None
         self.direct_select_drag_index = None
+        # Visible anchor handles as (handle_id, shape_id, coord_index), drawn from a
+        # pool of rectangles that are hidden and reused instead of deleted
+        self.direct_select_anchors = []
+        self.anchor_pool = []
 
         self.history = EditorHistory()
 
         # Dictionary to keep a reference to images (store tuples of (PIL_image, PhotoImage))
         self.image_refs = {}
+        # Content-addressed PIL images (digest -> image); history snapshots only keep the digest
+        self.image_pool = {}
+
+        # Text editor dialog, created on first use and reused afterwards
+        self.text_editor_dialog = None
 
         # New attributes for polygon and star configuration
         self.polygon_config = None
@@ -297,6 +837,9 @@ class SimpleImageEditor:
         self.canvas.bind("<KeyPress-a>", self.on_key_toggle_anchor)
         self.canvas.focus_set()
 
+        if NUMBA_AVAILABLE:
+            _numba_warmup()
+
     # -------------------- UI BUILD METHODS -----------------------------
     def build_frames(self):
         self.toolbar_frame = tk.Frame(self.root, width=140, bg="#E0E0E0")
@@ -349,12 +892,9 @@ class SimpleImageEditor:
         self.bend_dragging = False
         self.bend_target = None
         self.bendA_dragging_anchor_idx = None
-        self.bendA_segment_idx = None
         self.bendB_dragging_anchor_idx = None
         self.initial_angle = None
-        if self.select_rect_id:
-            self.canvas.delete(self.select_rect_id)
-            self.select_rect_id = None
+        self.hide_select_marquee()
         self.clear_direct_select_anchors()
         for n, btn in self.tool_buttons.items():
             btn.config(relief=tk.SUNKEN if n == tool_name else tk.RAISED,
@@ -371,6 +911,17 @@ class SimpleImageEditor:
         self.canvas.bind("<Button-1>", self.on_left_down)
         self.canvas.bind("<B1-Motion>", self.on_left_drag)
         self.canvas.bind("<ButtonRelease-1>", self.on_left_up)
+        self.create_select_marquee()
+
+    def create_select_marquee(self):
+        self.select_rect_id = self.canvas.create_rectangle(0, 0, 0, 0, outline="gray", dash=(2,2),
+                                                           state=tk.HIDDEN)
+        self.marquee_active = False
+
+    def hide_select_marquee(self):
+        if self.marquee_active:
+            self.canvas.itemconfigure(self.select_rect_id, state=tk.HIDDEN)
+            self.marquee_active = False
 
     def setup_tool_options(self):
         f = tk.Frame(self.main_frame, bg="#DDDDDD", height=50)
@@ -426,7 +977,7 @@ class SimpleImageEditor:
     def add_layer(self, name=None):
         if name is None:
             name = f"Layer {len(self.layers)+1}"
-        new_layer = Layer(name)
+        new_layer = Layer(name, registry=self.item_layer)
         self.layers.insert(0, new_layer)
         self.layer_listbox.insert(0, name)
         self.layer_listbox.selection_clear(0, tk.END)
@@ -502,6 +1053,7 @@ class SimpleImageEditor:
         for (iid, _) in layer.items:
             self.canvas.delete(iid)
             self.shape_data.remove(iid)
+            self.item_layer.pop(iid, None)
         nm = layer.name
         self.layers.pop(idx)
         self.layer_listbox.delete(idx)
@@ -511,9 +1063,12 @@ class SimpleImageEditor:
 
     # --------------------- HISTORY METHODS -------------------------------
     def push_history(self, description):
+        changed = self.shape_data.take_dirty()
         self.history.push_state(self.shape_data, self.layers, description)
         self.refresh_history_listbox()
-        self.auto_connect_lines()
+        self.auto_connect_lines(changed)
+        for h in self.history.take_released():
+            self.image_pool.pop(h, None)
 
     def refresh_history_listbox(self):
         self.history_listbox.delete(0, tk.END)
@@ -554,64 +1109,31 @@ class SimpleImageEditor:
     def apply_history_state(self, state):
         shape_dict, layers_c, desc = state
         self.canvas.delete("all")
-        self.shape_data.shapes.clear()
+        self.direct_select_anchors = []
+        self.anchor_pool.clear()
+        self.image_refs.clear()
+        self.shape_data.clear()
         self.layers.clear()
+        self.item_layer.clear()
+        # Restored items are drawn at their base width
+        self.prev_highlight.clear()
         self.layer_listbox.delete(0, tk.END)
         self.selected_items.clear()
         for item in list(self.canvas.find_all()):
             self.canvas.delete(item)
+        self.create_select_marquee()
         old_to_new = {}
+        restore_default = _RESTORE[None]
+        restore_shape = self.shape_data.restore
         for old_id, sdata in shape_dict.items():
-            stype = sdata['type']
-            coords = sdata['coords']
-            fill = sdata['fill']
-            outl = sdata['outline']
-            wd = sdata['width']
-            new_id = None
-            if stype == "line":
-                new_id = self.canvas.create_line(*coords, fill=outl, width=wd,
-                                                   smooth=True, splinesteps=36)
-            elif stype == "rectangle":
-                new_id = self.canvas.create_rectangle(*coords, outline=outl, fill=fill, width=wd)
-            elif stype == "ellipse":
-                new_id = self.canvas.create_oval(*coords, outline=outl, fill=fill, width=wd)
-            elif stype == "editable_text":
-                props = sdata.get("text_props", {})
-                new_id = self.canvas.create_text(coords[0], coords[1],
-                                                 text=props.get("text", ""),
-                                                 fill=props.get("fill", self.stroke_color),
-                                                 font=(props.get("font", "Arial"), props.get("font_size", DEFAULT_FONT_SIZE)))
-                self.canvas.tag_bind(new_id, "<Double-Button-1>", lambda event, id=new_id: self.edit_text_item(id))
-            elif stype == "text":
-                new_id = self.canvas.create_text(coords[0], coords[1], text="Sample", fill=outl)
-            elif stype == "image":
-                new_id = self.canvas.create_text(coords[0], coords[1],
-                                                 text="(Missing image in snapshot)",
-                                                 fill="red")
-            elif stype == "group":
-                if "children" in sdata and sdata["children"]:
-                    bbs = [self.canvas.bbox(child) for child in sdata["children"] if self.canvas.bbox(child)]
-                    if bbs:
-                        x1 = min(bb[0] for bb in bbs)
-                        y1 = min(bb[1] for bb in bbs)
-                        x2 = max(bb[2] for bb in bbs)
-                        y2 = max(bb[3] for bb in bbs)
-                        new_id = self.canvas.create_rectangle(x1, y1, x2, y2, outline="purple", dash=(4,2))
-                    else:
-                        new_id = self.canvas.create_rectangle(0, 0, 0, 0)
-                else:
-                    new_id = self.canvas.create_rectangle(0, 0, 0, 0)
-            else:
-                new_id = self.canvas.create_line(*coords, fill=outl, width=wd)
+            new_id = _RESTORE.get(sdata['type'], restore_default)(self, sdata)
             old_to_new[old_id] = new_id
-            self.shape_data.shapes[new_id] = copy.deepcopy(sdata)
+            restore_shape(new_id, _clone_shape(sdata))
         for laycopy in layers_c:
-            new_layer = Layer(laycopy.name, laycopy.visible, laycopy.locked)
-            ni = []
+            new_layer = Layer(laycopy.name, laycopy.visible, laycopy.locked, registry=self.item_layer)
             for (iid, st) in laycopy.items:
                 if iid in old_to_new:
-                    ni.append((old_to_new[iid], st))
-            new_layer.items = ni
+                    new_layer.add_item(old_to_new[iid], st)
             self.layers.append(new_layer)
             lbname = laycopy.name + ("" if laycopy.visible else " (hidden)")
             self.layer_listbox.insert(tk.END, lbname)
@@ -621,6 +1143,14 @@ class SimpleImageEditor:
                     self.canvas.itemconfigure(iid, state=tk.HIDDEN)
 
     # --------------------- IMAGE METHODS (New) -----------------------------
+    def pool_image(self, pil_image):
+        """Adds the image to the content-addressed pool and returns its digest."""
+        digest = hashlib.blake2b(f"{pil_image.mode}{pil_image.size}".encode(), digest_size=16)
+        digest.update(pil_image.tobytes())
+        h = digest.hexdigest()
+        self.image_pool.setdefault(h, pil_image)
+        return h
+
     def open_image(self):
         """Opens an image file using Pillow and places it on the canvas."""
         if not PIL_AVAILABLE:
@@ -643,6 +1173,7 @@ class SimpleImageEditor:
             self.image_refs[item] = (pil_image, tk_image)
             # Store shape data for the image
             self.shape_data.store(item, "image", [0, 0, pil_image.width, pil_image.height], None, "", 0)
+            self.shape_data.shapes[item]['image_hash'] = self.pool_image(pil_image)
             if self.current_layer_index is None:
                 self.add_layer("Image Layer")
                 self.current_layer_index = 0
@@ -667,25 +1198,44 @@ class SimpleImageEditor:
         if not stored:
             messagebox.showerror("Error", "No image found.")
             return
-        pil_image, _ = stored
-        # Rotate the image using Pillow (expand to adjust the size)
-        rotated = pil_image.rotate(angle, expand=True)
-        new_tk_image = ImageTk.PhotoImage(rotated)
-        self.image_refs[item] = (rotated, new_tk_image)
-        self.canvas.itemconfig(item, image=new_tk_image)
+        pil_image, tk_image = stored
+        quarter_turns = int(angle // 90) % 4 if angle % 90 == 0 else None
+        if quarter_turns == 0:
+            return
+        if quarter_turns is not None:
+            # Multiples of 90 degrees are a pure pixel transpose: no resampling,
+            # no padding, and repeated turns compose without any quality loss
+            rotated = pil_image.transpose(QUARTER_TURN_TRANSPOSE[quarter_turns])
+        else:
+            # Rotate the image using Pillow (expand to adjust the size)
+            rotated = pil_image.rotate(angle, expand=True)
+        if rotated.size == pil_image.size:
+            # Same footprint (e.g. 180 degrees): upload into the existing Tk image
+            tk_image.paste(rotated)
+        else:
+            tk_image = ImageTk.PhotoImage(rotated)
+            self.canvas.itemconfig(item, image=tk_image)
+        self.image_refs[item] = (rotated, tk_image)
+        shape['image_hash'] = self.pool_image(rotated)
+        x, y = shape['coords'][0], shape['coords'][1]
+        self.shape_data.update_coords(item, [x, y, x + rotated.width, y + rotated.height])
         self.push_history("Rotated image")
 
     # --------------------- EDITABLE TEXT METHODS -----------------------------
+    def ask_text_props(self, title, initial_props=None):
+        if self.text_editor_dialog is None:
+            self.text_editor_dialog = TextEditorDialog(self.root)
+        return self.text_editor_dialog.ask(title, initial_props)
+
     def create_editable_text(self, x, y):
-        dialog = TextEditorDialog(self.root, title="Create Text")
-        if dialog.result:
-            props = dialog.result
+        props = self.ask_text_props("Create Text")
+        if props:
             item = self.canvas.create_text(x, y, text=props["text"],
                                            fill=props["fill"],
                                            font=(props["font"], props["font_size"]))
             # Use a simple approximate bounding box
             self.shape_data.store(item, "editable_text", [x, y, x+100, y+30], None, props["fill"], 1)
-            self.shape_data.shapes[item]["text_props"] = props
+            self.shape_data.shapes[item]["text_props"] = MappingProxyType(props)
             self.canvas.tag_bind(item, "<Double-Button-1>", lambda event, id=item: self.edit_text_item(id))
             if self.current_layer_index is not None:
                 self.layers[self.current_layer_index].add_item(item, "editable_text")
@@ -695,13 +1245,13 @@ class SimpleImageEditor:
 
     def edit_text_item(self, item):
         props = self.shape_data.get(item).get("text_props", {})
-        dialog = TextEditorDialog(self.root, title="Edit Text", initial_props=props)
-        if dialog.result:
-            new_props = dialog.result
+        new_props = self.ask_text_props("Edit Text", initial_props=props)
+        if new_props:
             self.canvas.itemconfig(item, text=new_props["text"],
                                    fill=new_props["fill"],
                                    font=(new_props["font"], new_props["font_size"]))
-            self.shape_data.shapes[item]["text_props"] = new_props
+            # Replace rather than mutate: history snapshots share the old mapping
+            self.shape_data.shapes[item]["text_props"] = MappingProxyType(new_props)
             self.push_history("Edited text")
 
     # --------------------- KEYBOARD SHORTCUTS FOR RECOLORING ----------------
@@ -780,7 +1330,7 @@ class SimpleImageEditor:
             if self.current_layer_index is not None:
                 self.layers[self.current_layer_index].add_item(self.temp_item, "star")
         elif self.current_tool == "Recolor":
-            it = self.canvas.find_closest(event.x, event.y)
+            it = self.pick(event.x, event.y)
             if it:
                 iid = it[0]
                 self.selected_items = {iid}
@@ -807,119 +1357,175 @@ class SimpleImageEditor:
         elif self.current_tool == "Text":
             self.create_editable_text(event.x, event.y)
         elif self.current_tool == "Sharp Eraser":
-            it = self.canvas.find_closest(event.x, event.y)
-            if it:
-                shape = self.shape_data.get(it[0])
-                if shape and shape['type'] in ("line", "brush", "bending_line"):
-                    self.round_erase_anchor_points(it[0], event.x, event.y, radius=ERASER_RADIUS * 0.5)
+            hits = self.find_items_near(event.x, event.y, ERASER_RADIUS * 0.5)
+            if hits:
+                for iid in hits:
+                    self.round_erase_anchor_points(iid, event.x, event.y, radius=ERASER_RADIUS * 0.5)
                 self.push_history("Sharp Eraser used")
         elif self.current_tool == "Round Eraser":
-            it = self.canvas.find_closest(event.x, event.y)
-            if it:
-                shape = self.shape_data.get(it[0])
-                if shape and shape['type'] in ("line", "brush", "bending_line"):
-                    self.round_erase_anchor_points(it[0], event.x, event.y, radius=ERASER_RADIUS)
+            hits = self.find_items_near(event.x, event.y, ERASER_RADIUS)
+            if hits:
+                for iid in hits:
+                    self.round_erase_anchor_points(iid, event.x, event.y, radius=ERASER_RADIUS)
                 self.push_history("Round Eraser used")
         elif self.current_tool == "Soft Eraser":
-            it = self.canvas.find_closest(event.x, event.y)
-            if it:
-                shape = self.shape_data.get(it[0])
-                if shape:
-                    self.soft_erase_shape(it[0])
+            hits = self.find_items_near(event.x, event.y, ERASER_RADIUS)
+            if hits:
+                for iid in hits:
+                    self.soft_erase_shape(iid)
                 self.push_history("Soft Eraser used")
-        if self.current_tool == "Select" and not self.canvas.find_closest(event.x, event.y):
-            self.select_rect_id = self.canvas.create_rectangle(event.x, event.y, event.x, event.y,
-                                                                outline="gray", dash=(2,2))
+        if self.current_tool == "Select" and not self.pick(event.x, event.y):
+            self.canvas.coords(self.select_rect_id, event.x, event.y, event.x, event.y)
+            self.canvas.itemconfigure(self.select_rect_id, state=tk.NORMAL)
+            self.canvas.tag_raise(self.select_rect_id)
+            self.marquee_active = True
 
     def on_left_drag(self, event):
+        # Motion events arrive faster than the screen refreshes: keep only the
+        # latest position and apply it once the queued events are drained
+        # (after_idle), but no more than once per frame. Freehand tools build
+        # their stroke from the samples, so those are buffered rather than dropped.
+        self.pending_drag = (event.x, event.y)
+        if self.current_tool in ("Brush", "Bend Tool C"):
+            self.pending_points.append((event.x, event.y))
+        if self.drag_flush_id is None:
+            wait_ms = DRAG_FRAME_MS - (time.monotonic() - self.last_drag_flush) * 1000.0
+            if wait_ms > 0:
+                self.drag_flush_id = self.root.after(int(wait_ms) + 1, self.flush_drag)
+            else:
+                self.drag_flush_id = self.root.after_idle(self.flush_drag)
+
+    def flush_drag(self):
+        if self.drag_flush_id is not None:
+            self.root.after_cancel(self.drag_flush_id)
+            self.drag_flush_id = None
+        if self.pending_drag is None:
+            return
+        x, y = self.pending_drag
+        points = self.pending_points
+        self.pending_drag = None
+        self.pending_points = []
+        self.last_drag_flush = time.monotonic()
+        with self.batch_draw():
+            self.process_drag(x, y, points)
+
+    @contextmanager
+    def batch_draw(self):
+        """
+        Groups canvas mutations into one redraw. Anchor-handle updates requested
+        inside the block are deferred until the outermost block exits, then
+        applied once per shape before Tk is allowed to repaint.
+        """
+        self.batch_depth += 1
+        try:
+            yield
+        finally:
+            self.batch_depth -= 1
+            if not self.batch_depth:
+                for item_id, indices in self.anchor_redraw.items():
+                    if indices is None:
+                        self.update_direct_select_anchors(item_id)
+                    else:
+                        for idx in indices:
+                            self.update_direct_select_anchors(item_id, idx)
+                self.anchor_redraw.clear()
+                self.canvas.update_idletasks()
+
+    def process_drag(self, x, y, points=()):
         if self.current_layer_index is None:
             return
         layer = self.layers[self.current_layer_index]
         if layer.locked or not layer.visible:
             return
         if self.current_tool == "Select":
-            if self.select_rect_id:
-                self.canvas.coords(self.select_rect_id, self.start_x, self.start_y, event.x, event.y)
+            if self.marquee_active:
+                self.canvas.coords(self.select_rect_id, self.start_x, self.start_y, x, y)
             else:
                 if len(self.selected_items) == 1:
-                    self.move_entire_shape(event.x, event.y)
+                    self.move_entire_shape(x, y)
         elif self.current_tool == "Direct Select" and self.direct_select_dragging_anchor is not None:
-            self.handle_direct_select_drag(event.x, event.y)
+            self.handle_direct_select_drag(x, y)
         elif self.current_tool in ("Bend Tool A", "Bend Tool B") and self.bend_dragging:
-            self.handle_bend_tool_drag(event.x, event.y)
+            self.handle_bend_tool_drag(x, y)
         elif self.current_tool == "Bend Tool C":
-            self.handle_draw_bending_line_drag(event.x, event.y)
+            self.handle_draw_bending_line_drag(points or [(x, y)])
         elif self.current_tool == "Brush":
-            dx = event.x - self.last_x
-            dy = event.y - self.last_y
-            if abs(dx) > 1 or abs(dy) > 1:
-                ln = self.canvas.create_line(self.last_x, self.last_y, event.x, event.y,
-                                              fill=self.stroke_color, width=self.brush_size,
-                                              smooth=True, splinesteps=36)
-                layer.add_item(ln, "brush")
-                self.shape_data.store(ln, "brush", [self.last_x, self.last_y, event.x, event.y],
-                                       None, self.stroke_color, self.brush_size)
-                self.selected_items = {ln}
-                self.highlight_selection()
-                self.last_x, self.last_y = event.x, event.y
+            if self.brush_item is not None:
+                # Grow the stroke's single polyline rather than adding a line per move,
+                # and redraw it once for all the samples of this frame
+                grew = False
+                for (px, py) in points or [(x, y)]:
+                    if abs(px - self.last_x) > 1 or abs(py - self.last_y) > 1:
+                        if self.brush_placeholder:
+                            # The first real sample takes the placeholder's place
+                            start = self.shape_data.get(self.brush_item)['coords'][:2]
+                            self.shape_data.update_coords(self.brush_item, [start[0], start[1], px, py])
+                            self.brush_placeholder = False
+                        else:
+                            self.shape_data.append_point(self.brush_item, px, py)
+                        self.last_x, self.last_y = px, py
+                        grew = True
+                if grew:
+                    self.canvas.coords(self.brush_item, *self.shape_data.get(self.brush_item)['coords'])
         elif self.current_tool == "Polygon":
             if self.temp_item:
-                dx = event.x - self.start_x
-                dy = event.y - self.start_y
+                dx = x - self.start_x
+                dy = y - self.start_y
                 radius = math.hypot(dx, dy)
                 sides = self.polygon_config["sides"]
                 angle_offset = -math.pi/2  # so one vertex is at the top
                 coords = []
                 for i in range(sides):
                     angle = angle_offset + 2 * math.pi * i / sides
-                    x = self.start_x + radius * math.cos(angle)
-                    y = self.start_y + radius * math.sin(angle)
-                    coords.extend([x, y])
+                    vx = self.start_x + radius * math.cos(angle)
+                    vy = self.start_y + radius * math.sin(angle)
+                    coords.extend([vx, vy])
                 self.canvas.coords(self.temp_item, *coords)
         elif self.current_tool == "Star":
             if self.temp_item:
-                dx = event.x - self.start_x
-                dy = event.y - self.start_y
+                dx = x - self.start_x
+                dy = y - self.start_y
                 outer_radius = math.hypot(dx, dy)
                 inner_radius = outer_radius * 0.5  # fixed ratio for inner points
-                points = self.star_config["points"]
+                n_points = self.star_config["points"]
                 angle_offset = -math.pi/2  # so one outer vertex is at the top
                 vertices = []
-                for i in range(2 * points):
-                    angle = angle_offset + i * math.pi / points
+                for i in range(2 * n_points):
+                    angle = angle_offset + i * math.pi / n_points
                     r = outer_radius if i % 2 == 0 else inner_radius
-                    x = self.start_x + r * math.cos(angle)
-                    y = self.start_y + r * math.sin(angle)
-                    vertices.extend([x, y])
+                    vx = self.start_x + r * math.cos(angle)
+                    vy = self.start_y + r * math.sin(angle)
+                    vertices.extend([vx, vy])
                 self.canvas.coords(self.temp_item, *vertices)
         elif self.current_tool in ("Line", "Rectangle", "Ellipse"):
             if self.temp_item:
                 self.canvas.delete(self.temp_item)
             if self.current_tool == "Line":
-                self.temp_item = self.canvas.create_line(self.start_x, self.start_y, event.x, event.y,
+                self.temp_item = self.canvas.create_line(self.start_x, self.start_y, x, y,
                                                           fill=self.stroke_color, width=self.brush_size,
                                                           smooth=True, splinesteps=36)
             elif self.current_tool == "Rectangle":
-                x1, y1, x2, y2 = self.normalize_rect([self.start_x, self.start_y, event.x, event.y])
+                x1, y1, x2, y2 = self.normalize_rect([self.start_x, self.start_y, x, y])
                 self.temp_item = self.canvas.create_rectangle(x1, y1, x2, y2,
                                                               outline=self.stroke_color,
                                                               fill=(self.fill_color if self.fill_enabled_var.get() else ""),
                                                               width=self.brush_size)
             elif self.current_tool == "Ellipse":
-                x1, y1, x2, y2 = self.normalize_rect([self.start_x, self.start_y, event.x, event.y])
+                x1, y1, x2, y2 = self.normalize_rect([self.start_x, self.start_y, x, y])
                 self.temp_item = self.canvas.create_oval(x1, y1, x2, y2,
                                                          outline=self.stroke_color,
                                                          fill=(self.fill_color if self.fill_enabled_var.get() else ""),
                                                          width=self.brush_size)
 
     def on_left_up(self, event):
+        # Apply the last coalesced motion before finishing the gesture
+        self.flush_drag()
         if self.current_tool == "Select":
-            if self.select_rect_id:
+            if self.marquee_active:
                 x1, y1, x2, y2 = self.canvas.coords(self.select_rect_id)
+                self.hide_select_marquee()
                 ids = set(self.canvas.find_enclosed(x1, y1, x2, y2))
                 self.selected_items |= ids
-                self.canvas.delete(self.select_rect_id)
-                self.select_rect_id = None
                 self.highlight_selection()
                 self.push_history("Multi-selected items")
                 return
@@ -946,6 +1552,11 @@ class SimpleImageEditor:
             self.handle_draw_bending_line_up()
             self.push_history("Created bending line")
             return
+        elif self.current_tool == "Brush":
+            if self.brush_item is not None:
+                self.brush_item = None
+                self.push_history("Brush stroke")
+            return
         elif self.current_tool == "Polygon":
             if self.temp_item:
                 coords = self.canvas.coords(self.temp_item)
@@ -984,7 +1595,7 @@ class SimpleImageEditor:
             self.direct_select_dragging_anchor = found
             self.direct_select_drag_index = found[1]
         else:
-            it = self.canvas.find_closest(x, y)
+            it = self.pick(x, y)
             if it:
                 sid = it[0]
                 shape = self.shape_data.get(sid)
@@ -1002,11 +1613,13 @@ class SimpleImageEditor:
         if not shape:
             return
         coords = shape["coords"]
+        if abs(coords[idx] - x) + abs(coords[idx + 1] - y) < 1:
+            return
         coords[idx] = x
         coords[idx + 1] = y
         self.canvas.coords(sid, *coords)
         self.shape_data.update_coords(sid, coords)
-        self.update_direct_select_anchors(sid)
+        self.update_direct_select_anchors(sid, idx)
 
     # --------------------- UTILITY METHODS -------------------------------
     @staticmethod
@@ -1045,6 +1658,19 @@ class SimpleImageEditor:
         if not fp:
             return
         self.canvas.update()
+        if PIL_AVAILABLE and EpsImagePlugin.has_ghostscript():
+            # Render the canvas display list in-process; no screen grab needed.
+            # A page width of w points makes one canvas pixel one pixel at 72 dpi.
+            w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+            try:
+                ps = self.canvas.postscript(colormode="color", x=0, y=0, width=w, height=h,
+                                            pagewidth=f"{w}p")
+                Image.open(io.BytesIO(ps.encode("utf-8"))).save(fp)
+                print("Saved snapshot to", fp)
+            except Exception as e:
+                messagebox.showerror("Error", f"Error saving snapshot: {e}")
+            return
+        # Without Ghostscript Pillow cannot rasterize PostScript: grab the screen instead
         x0 = self.root.winfo_rootx() + self.canvas.winfo_x()
         y0 = self.root.winfo_rooty() + self.canvas.winfo_y()
         x1 = x0 + self.canvas.winfo_width()
@@ -1073,18 +1699,21 @@ class SimpleImageEditor:
         self.shape_data.shapes[self.temp_item]['anchors'].append(0)
         self.last_x, self.last_y = x, y
 
-    def handle_draw_bending_line_drag(self, x, y):
+    def handle_draw_bending_line_drag(self, points):
+        """Appends every buffered sample as an anchored point, then redraws the line once."""
         if self.temp_item is None:
             return
-        coords = self.canvas.coords(self.temp_item)
-        coords.extend([x, y])
+        shape = self.shape_data.get(self.temp_item)
+        coords = shape['coords']
+        anchor_indices = shape['anchors']
+        for (x, y) in points:
+            self.shape_data.append_point(self.temp_item, x, y)
+            last = len(coords) - 2
+            i = bisect_left(anchor_indices, last)
+            if i == len(anchor_indices) or anchor_indices[i] != last:
+                anchor_indices.insert(i, last)
+            self.last_x, self.last_y = x, y
         self.canvas.coords(self.temp_item, *coords)
-        self.shape_data.update_coords(self.temp_item, coords)
-        anchor_indices = self.shape_data.shapes[self.temp_item]['anchors']
-        if (len(coords) - 2) not in anchor_indices:
-            anchor_indices.append(len(coords) - 2)
-            anchor_indices.sort()
-        self.last_x, self.last_y = x, y
 
     def handle_draw_bending_line_up(self):
         if self.temp_item is None:
@@ -1101,6 +1730,8 @@ class SimpleImageEditor:
         layer.add_item(ln, "brush")
         self.shape_data.store(ln, "brush", [x, y, x + 1, y + 1],
                               None, self.stroke_color, self.brush_size)
+        self.brush_item = ln
+        self.brush_placeholder = True
         self.selected_items = {ln}
         self.highlight_selection()
 
@@ -1122,11 +1753,16 @@ class SimpleImageEditor:
             return
         if shape['type'] not in ("line", "brush", "bending_line"):
             return
-        coords = shape['coords']
-        new_coords = []
-        for i in range(0, len(coords), 2):
-            if math.hypot(coords[i] - ex, coords[i + 1] - ey) >= radius:
-                new_coords.extend([coords[i], coords[i + 1]])
+        if NUMBA_AVAILABLE:
+            buf = np.array(shape['coords'], dtype=np.float64)
+            n = _compact_outside_radius_jit(buf, float(ex), float(ey), float(radius))
+            new_coords = buf[:n].tolist()
+        else:
+            new_coords = shape['coords'][:]
+            n = _compact_outside_radius(new_coords, ex, ey, radius)
+            del new_coords[n:]
+        if n == len(shape['coords']):
+            return
         if len(new_coords) < 4:
             self.erase_item(item_id)
             return
@@ -1137,19 +1773,6 @@ class SimpleImageEditor:
         shape = self.shape_data.get(item_id)
         if not shape:
             return
-        def fade_color(hc):
-            if not hc or len(hc) != 7:
-                return hc
-            r = int(hc[1:3], 16)
-            g = int(hc[3:5], 16)
-            b = int(hc[5:7], 16)
-            target = 255
-            def fch(c):
-                diff = target - c
-                if abs(diff) < SOFT_ERASER_FADE_STEP:
-                    return target
-                return c + SOFT_ERASER_FADE_STEP if diff > 0 else c - SOFT_ERASER_FADE_STEP
-            return f"#{fch(r):02x}{fch(g):02x}{fch(b):02x}"
         new_outline = fade_color(shape['outline'])
         new_fill = fade_color(shape['fill'])
         shape['outline'] = new_outline
@@ -1169,29 +1792,61 @@ class SimpleImageEditor:
             self.selected_items.remove(item_id)
 
     # --------------------- UTILITY METHODS ---------------------------------
+    def find_items_near(self, x, y, radius):
+        """
+        Visible shapes on unlocked layers that come within radius of (x, y).
+        The spatial index narrows the candidates by bounding box; the canvas then
+        confirms each against the item's real geometry (an unfilled shape is only
+        hit on its outline) and leaves out hidden items.
+        """
+        box = (x - radius, y - radius, x + radius, y + radius)
+        hits = self.shape_data.index.intersection(box)
+        if not hits:
+            return []
+        overlapping = set(self.canvas.find_overlapping(*box))
+        found = []
+        for iid in hits:
+            if iid not in overlapping:
+                continue
+            layer = self.find_layer_of_item(iid)
+            if layer is not None and layer.locked:
+                continue
+            found.append(iid)
+        return found
+
+    def pick(self, x, y, radius=6):
+        """
+        Topmost shape within radius of (x, y), as a 0- or 1-tuple like find_closest.
+        Marquee and anchor handles are not shapes, so they are never picked.
+        """
+        shapes = self.shape_data.shapes
+        for iid in reversed(self.canvas.find_overlapping(x - radius, y - radius, x + radius, y + radius)):
+            if iid in shapes:
+                return (iid,)
+        return ()
+
     def find_layer_of_item(self, item_id):
-        for layer in self.layers:
-            for (iid, _) in layer.items:
-                if iid == item_id:
-                    return layer
-        return None
+        return self.item_layer.get(item_id)
 
     def highlight_selection(self):
-        for item in self.canvas.find_all():
-            try:
-                base_width = self.shape_data.get(item)['width']
-                self.canvas.itemconfig(item, width=base_width)
-            except Exception:
-                pass
-        for sid in self.selected_items:
-            try:
-                base_width = self.shape_data.get(sid)['width']
-                self.canvas.itemconfig(sid, width=max(base_width + 2, 3))
-            except Exception:
-                pass
+        # Only touch items whose selection state changed since the last call
+        base_width = self.shape_data.base_width
+        for item in self.prev_highlight - self.selected_items:
+            if item in base_width:
+                try:
+                    self.canvas.itemconfig(item, width=base_width[item])
+                except Exception:
+                    pass
+        for sid in self.selected_items - self.prev_highlight:
+            if sid in base_width:
+                try:
+                    self.canvas.itemconfig(sid, width=max(base_width[sid] + 2, 3))
+                except Exception:
+                    pass
+        self.prev_highlight = set(self.selected_items)
 
     def handle_select_click(self, x, y, add=False):
-        it = self.canvas.find_closest(x, y)
+        it = self.pick(x, y)
         if it:
             iid = it[0]
             layer = self.find_layer_of_item(iid)
@@ -1225,8 +1880,8 @@ class SimpleImageEditor:
 
     # --------------------- DIRECT SELECT ANCHOR METHODS ---------------------
     def clear_direct_select_anchors(self):
-        for (hid, _, _) in getattr(self, "direct_select_anchors", []):
-            self.canvas.delete(hid)
+        for (hid, _, _) in self.direct_select_anchors:
+            self.canvas.itemconfigure(hid, state=tk.HIDDEN)
         self.direct_select_anchors = []
 
     def show_direct_select_anchors(self, item_id):
@@ -1236,19 +1891,43 @@ class SimpleImageEditor:
             return
         coords = shape['coords']
         anchors = shape.get('anchors', [])
-        self.direct_select_anchors = []
+        pool = self.anchor_pool
+        while len(pool) < len(coords) // 2:
+            pool.append(self.canvas.create_rectangle(0, 0, 0, 0, state=tk.HIDDEN, tags=("anchor_handle",)))
         for i in range(0, len(coords), 2):
             x = coords[i]
             y = coords[i+1]
             color = "red" if i in anchors else "blue"
-            hid = self.canvas.create_rectangle(x - 3, y - 3, x + 3, y + 3, fill=color, outline=color)
+            hid = pool[i // 2]
+            self.canvas.coords(hid, x - 3, y - 3, x + 3, y + 3)
+            self.canvas.itemconfigure(hid, fill=color, outline=color, state=tk.NORMAL)
             self.direct_select_anchors.append((hid, item_id, i))
-
-    def update_direct_select_anchors(self, item_id):
+        # Pooled handles may sit below shapes drawn since they were created
+        self.canvas.tag_raise("anchor_handle")
+
+    def update_direct_select_anchors(self, item_id, changed_idx=None):
+        """Moves and recolours the shape's handles; with changed_idx only that point's handle moves."""
+        if self.batch_depth:
+            pending = self.anchor_redraw
+            if changed_idx is None:
+                pending[item_id] = None
+            elif pending.get(item_id, ()) is not None:
+                pending.setdefault(item_id, set()).add(changed_idx)
+            return
         shape = self.shape_data.get(item_id)
         if not shape:
             return
         coords = shape['coords']
+        if changed_idx is not None:
+            # Handles are laid out one per point, in coord order
+            k = changed_idx // 2
+            if k < len(self.direct_select_anchors):
+                hid, sid, idx = self.direct_select_anchors[k]
+                if sid == item_id:
+                    x = coords[idx]
+                    y = coords[idx + 1]
+                    self.canvas.coords(hid, x - 3, y - 3, x + 3, y + 3)
+            return
         anchors = shape.get('anchors', [])
         for (hid, sid, idx) in self.direct_select_anchors:
             if sid == item_id:
@@ -1275,11 +1954,13 @@ class SimpleImageEditor:
                 anchors = shape.get('anchors', [])
                 if self.direct_select_drag_index is not None:
                     idx = self.direct_select_drag_index
-                    if idx in anchors:
-                        anchors.remove(idx)
+                    # Anchor lists are kept sorted, so toggle in place
+                    i = bisect_left(anchors, idx)
+                    if i < len(anchors) and anchors[i] == idx:
+                        del anchors[i]
                     else:
-                        anchors.append(idx)
-                    shape['anchors'] = sorted(anchors)
+                        anchors.insert(i, idx)
+                    shape['anchors'] = anchors
                     self.update_direct_select_anchors(sid)
             self.push_history("Toggled anchor status")
 
@@ -1312,7 +1993,7 @@ class SimpleImageEditor:
 
     # --------------------- ADD ANCHOR METHOD -------------------------------
     def handle_add_anchor_click(self, mx, my):
-        it = self.canvas.find_closest(mx, my)
+        it = self.pick(mx, my)
         if not it:
             return
         iid = it[0]
@@ -1335,10 +2016,9 @@ class SimpleImageEditor:
             insert_x = x1 + t * (x2 - x1)
             insert_y = y1 + t * (y2 - y1)
             insert_idx = seg_i + 2
-        coords.insert(insert_idx, insert_y)
-        coords.insert(insert_idx, insert_x)
-        shape['anchors'].append(insert_idx)
-        shape['anchors'] = sorted(shape['anchors'])
+        # One splice instead of two shifting inserts (stroke coords are arrays)
+        coords[insert_idx:insert_idx] = array(coords.typecode, (insert_x, insert_y))
+        insort(shape['anchors'], insert_idx)
         self.canvas.coords(iid, *coords)
         self.shape_data.update_coords(iid, coords)
         self.selected_items = {iid}
@@ -1351,25 +2031,20 @@ class SimpleImageEditor:
             return
         group_id = self.canvas.create_rectangle(0, 0, 0, 0, outline="purple", dash=(4, 2))
         children = list(self.selected_items)
-        boxes = []
+        # Tk computes the union bbox of everything carrying a tag in one call
         for cid in children:
-            bb = self.canvas.bbox(cid)
-            if bb:
-                boxes.append(bb)
-        if boxes:
-            x1 = min(bb[0] for bb in boxes)
-            y1 = min(bb[1] for bb in boxes)
-            x2 = max(bb[2] for bb in boxes)
-            y2 = max(bb[3] for bb in boxes)
-            self.canvas.coords(group_id, x1, y1, x2, y2)
-        else:
-            self.canvas.coords(group_id, 0, 0, 0, 0)
+            self.canvas.addtag_withtag("grouping", cid)
+        bb = self.canvas.bbox("grouping")
+        self.canvas.dtag("grouping")
+        self.canvas.coords(group_id, *(bb or (0, 0, 0, 0)))
         self.shape_data.store(group_id, "group", self.canvas.coords(group_id), None, "purple", 1)
         self.shape_data.shapes[group_id]['children'] = children
         for cid in children:
             self.canvas.itemconfigure(cid, state="hidden")
-            for layer in self.layers:
-                layer.items = [(iid, st) for (iid, st) in layer.items if iid != cid]
+        # Rebuild each affected layer's item list once, not once per child
+        child_set = set(children)
+        for layer in {self.find_layer_of_item(cid) for cid in children} - {None}:
+            layer.remove_items(child_set)
         if self.current_layer_index is not None:
             self.layers[self.current_layer_index].add_item(group_id, "group")
         self.selected_items = {group_id}
@@ -1377,53 +2052,68 @@ class SimpleImageEditor:
         self.push_history("Grouped items")
 
     # --------------------- AUTO-CONNECT LINES -----------------------------
-    def auto_connect_lines(self):
-        ids = list(self.shape_data.shapes.keys())
-        merged = False
-        for i in range(len(ids)):
-            id1 = ids[i]
+    def auto_connect_lines(self, changed_ids):
+        """
+        Merges strokes whose endpoints lie within CONNECT_THRESHOLD. Only the
+        shapes in changed_ids are matched, against neighbours found through
+        the spatial index.
+        """
+        pending = set(changed_ids)
+        while pending:
+            id1 = pending.pop()
             shape1 = self.shape_data.get(id1)
             if not shape1 or shape1['type'] not in ("line", "brush", "bending_line"):
                 continue
-            coords1 = shape1['coords']
-            endpoints1 = [(coords1[0], coords1[1]), (coords1[-2], coords1[-1])]
-            for j in range(i + 1, len(ids)):
-                id2 = ids[j]
-                shape2 = self.shape_data.get(id2)
-                if not shape2 or shape2['type'] not in ("line", "brush", "bending_line"):
-                    continue
-                coords2 = shape2['coords']
-                endpoints2 = [(coords2[0], coords2[1]), (coords2[-2], coords2[-1])]
-                for (p1, idx1) in zip(endpoints1, (0, len(coords1)-2)):
-                    for (p2, idx2) in zip(endpoints2, (0, len(coords2)-2)):
-                        if math.hypot(p1[0]-p2[0], p1[1]-p2[1]) < CONNECT_THRESHOLD:
-                            if idx1 == len(coords1)-2 and idx2 == 0:
-                                new_coords = coords1 + coords2[2:]
-                            elif idx1 == 0 and idx2 == len(coords2)-2:
-                                new_coords = coords2 + coords1[2:]
-                            elif idx1 == len(coords1)-2 and idx2 == len(coords2)-2:
-                                new_coords = coords1 + list(reversed(coords2[:-1]))
-                            elif idx1 == 0 and idx2 == 0:
-                                new_coords = list(reversed(coords2)) + coords1[2:]
-                            else:
-                                new_coords = coords1 + coords2
-                            self.canvas.coords(id1, *new_coords)
-                            self.shape_data.update_coords(id1, new_coords)
-                            self.erase_item(id2)
-                            merged = True
-                            break
-                    if merged:
-                        break
-                if merged:
+            for id2 in self.find_endpoint_neighbours(id1):
+                if self.connect_lines(id1, id2):
+                    # id1 grew a new endpoint, so look for neighbours again
+                    pending.add(id1)
+                    pending.discard(id2)
                     break
-            if merged:
-                break
-        if merged:
-            self.auto_connect_lines()
+
+    def find_endpoint_neighbours(self, item_id):
+        coords = self.shape_data.get(item_id)['coords']
+        t = CONNECT_THRESHOLD
+        found = set()
+        for (x, y) in ((coords[0], coords[1]), (coords[-2], coords[-1])):
+            found.update(self.shape_data.index.intersection((x - t, y - t, x + t, y + t)))
+        found.discard(item_id)
+        return sorted(found)
+
+    def connect_lines(self, id1, id2):
+        """Appends stroke id2 to id1 if two of their endpoints are close; returns True on merge."""
+        shape1 = self.shape_data.get(id1)
+        shape2 = self.shape_data.get(id2)
+        if not shape2 or shape2['type'] not in ("line", "brush", "bending_line"):
+            return False
+        coords1 = shape1['coords']
+        coords2 = shape2['coords']
+        endpoints1 = [(coords1[0], coords1[1]), (coords1[-2], coords1[-1])]
+        endpoints2 = [(coords2[0], coords2[1]), (coords2[-2], coords2[-1])]
+        t2 = CONNECT_THRESHOLD * CONNECT_THRESHOLD
+        for (p1, idx1) in zip(endpoints1, (0, len(coords1)-2)):
+            for (p2, idx2) in zip(endpoints2, (0, len(coords2)-2)):
+                ex, ey = p1[0] - p2[0], p1[1] - p2[1]
+                if ex * ex + ey * ey < t2:
+                    if idx1 == len(coords1)-2 and idx2 == 0:
+                        new_coords = coords1 + coords2[2:]
+                    elif idx1 == 0 and idx2 == len(coords2)-2:
+                        new_coords = coords2 + coords1[2:]
+                    elif idx1 == len(coords1)-2 and idx2 == len(coords2)-2:
+                        new_coords = coords1 + _reverse_points(coords2)[2:]
+                    elif idx1 == 0 and idx2 == 0:
+                        new_coords = _reverse_points(coords2) + coords1[2:]
+                    else:
+                        new_coords = coords1 + coords2
+                    self.canvas.coords(id1, *new_coords)
+                    self.shape_data.update_coords(id1, new_coords)
+                    self.erase_item(id2)
+                    return True
+        return False
 
     # --------------------- BEND TOOL METHODS -----------------------------
     def handle_bend_tool_down(self, x, y):
-        item = self.canvas.find_closest(x, y)
+        item = self.pick(x, y)
         if not item:
             self.selected_items.clear()
             return
@@ -1447,126 +2137,106 @@ class SimpleImageEditor:
             aidx = self.find_nearby_anchor(iid, x, y, radius=6)
             if aidx is not None:
                 self.bendA_dragging_anchor_idx = aidx
-            else:
-                self.bendA_segment_idx = self.find_closest_segment_index(x, y, coords)
+                self.bend_neighbour_anchors = self.neighbour_anchors(shape, aidx)
         if self.bendB_active:
             aidx = self.find_nearby_anchor(iid, x, y, radius=6)
             if aidx is not None:
                 self.bendB_dragging_anchor_idx = aidx
+                self.bend_neighbour_anchors = self.neighbour_anchors(shape, aidx)
         self.last_x, self.last_y = x, y
 
+    @staticmethod
+    def neighbour_anchors(shape, idx):
+        """The anchors just before and after idx (None at either end), looked up once per drag."""
+        anchors = sorted(shape.get('anchors', []))
+        pos = bisect_left(anchors, idx)
+        prev_anchor = anchors[pos - 1] if pos > 0 else None
+        next_anchor = anchors[pos + 1] if pos + 1 < len(anchors) else None
+        return prev_anchor, next_anchor
+
     def handle_bend_tool_drag(self, x, y):
         if not self.bend_dragging or not self.bend_target:
             return
+        # Repeated motion at the same position can't move anything
+        if abs(x - self.last_x) + abs(y - self.last_y) < 1:
+            return
         shape = self.shape_data.get(self.bend_target)
         if not shape:
             return
         coords = shape['coords']
+        changed = True
         if self.bendA_active:
             if self.bendA_dragging_anchor_idx is not None:
                 self.bend_tool_a_anchor_drag(shape, x, y)
             else:
-                self.bend_tool_a_push(coords, x, y)
+                changed = self.bend_tool_a_push(coords, x, y)
         elif self.bendB_active:
             if self.bendB_dragging_anchor_idx is not None:
                 self.bend_tool_b_anchor_drag(shape, x, y)
             else:
-                self.bend_tool_b_push(coords, x, y)
-        self.canvas.coords(self.bend_target, *coords)
-        self.shape_data.update_coords(self.bend_target, coords)
+                changed = self.bend_tool_b_push(coords, x, y)
+        if changed:
+            self.canvas.coords(self.bend_target, *coords)
+            self.shape_data.update_coords(self.bend_target, coords)
         self.last_x, self.last_y = x, y
 
     def bend_tool_a_anchor_drag(self, shape, mx, my):
         coords = shape['coords']
-        anchors = shape.get('anchors', [])
         idx = self.bendA_dragging_anchor_idx
         coords[idx] = mx
         coords[idx + 1] = my
-        sorted_anchors = sorted(anchors)
-        cur_pos = sorted_anchors.index(idx)
-        prev_anchor = sorted_anchors[cur_pos - 1] if cur_pos > 0 else None
-        next_anchor = sorted_anchors[cur_pos + 1] if cur_pos < len(sorted_anchors) - 1 else None
+        prev_anchor, next_anchor = self.bend_neighbour_anchors
         if prev_anchor is not None:
             self.local_anchor_interpolation(coords, prev_anchor, idx)
         if next_anchor is not None:
             self.local_anchor_interpolation(coords, idx, next_anchor)
 
     def bend_tool_a_push(self, coords, mx, my):
-        dx = mx - self.last_x
-        dy = my - self.last_y
-        radius = BEND_RADIUS_A
-        for i in range(0, len(coords), 2):
-            px, py = coords[i], coords[i + 1]
-            dist = math.hypot(px - self.last_x, py - self.last_y)
-            if dist < radius:
-                f = 1.0 - (dist / radius)
-                coords[i] += dx * f
-                coords[i + 1] += dy * f
+        return self.apply_bend_push(coords, mx - self.last_x, my - self.last_y, BEND_RADIUS_A)
 
     def bend_tool_b_anchor_drag(self, shape, mx, my):
         coords = shape['coords']
-        anchors = shape.get('anchors', [])
         idx = self.bendB_dragging_anchor_idx
         coords[idx] = mx
         coords[idx + 1] = my
-        sorted_anchors = sorted(anchors)
-        cur_pos = sorted_anchors.index(idx)
-        prev_anchor = sorted_anchors[cur_pos - 1] if cur_pos > 0 else None
-        next_anchor = sorted_anchors[cur_pos + 1] if cur_pos < len(sorted_anchors) - 1 else None
+        prev_anchor, next_anchor = self.bend_neighbour_anchors
         if prev_anchor is not None:
             self.arc_anchor_interpolation(coords, prev_anchor, idx)
         if next_anchor is not None:
             self.arc_anchor_interpolation(coords, idx, next_anchor)
 
     def bend_tool_b_push(self, coords, mx, my):
-        dx = mx - self.last_x
-        dy = my - self.last_y
-        radius = BEND_RADIUS_B
-        for i in range(0, len(coords), 2):
-            px, py = coords[i], coords[i + 1]
-            dist = math.hypot(px - self.last_x, py - self.last_y)
-            if dist < radius:
-                f = 1.0 - (dist / radius)
-                coords[i] += dx * f
-                coords[i + 1] += dy * f
+        return self.apply_bend_push(coords, mx - self.last_x, my - self.last_y, BEND_RADIUS_B)
+
+    def apply_bend_push(self, coords, dx, dy, radius):
+        """Runs the falloff push around the last pointer position; returns False if nothing can move."""
+        # Dirty region of this push: when it misses the target's indexed bounds no
+        # point is in range, so skip the kernel and the canvas/index updates
+        lx, ly = self.last_x, self.last_y
+        if not self.shape_data.index.overlaps(self.bend_target, (lx - radius, ly - radius, lx + radius, ly + radius)):
+            return False
+        if NUMBA_AVAILABLE:
+            # Zero-copy view: the kernel writes straight into the shape's array
+            _apply_bend_falloff_jit(np.frombuffer(coords, dtype=coords.typecode),
+                                    float(lx), float(ly), float(dx), float(dy), radius)
+        elif NUMPY_AVAILABLE:
+            _apply_bend_falloff_np(np.frombuffer(coords, dtype=coords.typecode).reshape(-1, 2),
+                                   self.last_x, self.last_y, dx, dy, radius)
+        else:
+            _apply_bend_falloff(coords, self.last_x, self.last_y, dx, dy, radius)
+        return True
 
     def arc_anchor_interpolation(self, coords, start_idx, end_idx):
-        x1, y1 = coords[start_idx], coords[start_idx + 1]
-        x2, y2 = coords[end_idx], coords[end_idx + 1]
-        num_points = (end_idx - start_idx) // 2 - 1
-        if num_points <= 0:
-            return
-        for i in range(1, num_points + 1):
-            t = i / (num_points + 1)
-            xi = (1 - t) * x1 + t * x2
-            yi = (1 - t) * y1 + t * y2
-            dx = x2 - x1
-            dy = y2 - y1
-            length = math.hypot(dx, dy)
-            offset = 10 * math.sin(math.pi * t) if length != 0 else 0
-            perp_dx = -dy / length if length != 0 else 0
-            perp_dy = dx / length if length != 0 else 0
-            new_x = xi + offset * perp_dx
-            new_y = yi + offset * perp_dy
-            idx = start_idx + 2 * i
-            coords[idx] = new_x
-            coords[idx + 1] = new_y
+        if NUMBA_AVAILABLE:
+            _arc_interpolation_jit(np.frombuffer(coords, dtype=coords.typecode), start_idx, end_idx)
+        else:
+            _arc_interpolation(coords, start_idx, end_idx)
 
     def local_anchor_interpolation(self, coords, start_idx, end_idx):
-        if end_idx < start_idx:
-            start_idx, end_idx = end_idx, start_idx
-        x1, y1 = coords[start_idx], coords[start_idx + 1]
-        x2, y2 = coords[end_idx], coords[end_idx + 1]
-        num_points = (end_idx - start_idx) // 2 - 1
-        if num_points <= 0:
-            return
-        for i in range(1, num_points + 1):
-            t = i / (num_points + 1)
-            xi = (1 - t) * x1 + t * x2
-            yi = (1 - t) * y1 + t * y2
-            idx = start_idx + 2 * i
-            coords[idx] = xi
-            coords[idx + 1] = yi
+        if NUMBA_AVAILABLE:
+            _linear_interpolation_jit(np.frombuffer(coords, dtype=coords.typecode), start_idx, end_idx)
+        else:
+            _linear_interpolation(coords, start_idx, end_idx)
 
     def find_nearby_anchor(self, item_id, mx, my, radius=6):
         shape = self.shape_data.get(item_id)
@@ -1581,28 +2251,14 @@ class SimpleImageEditor:
         return None
 
     def find_closest_segment_index(self, mx, my, coords):
-        best_i = None
-        best_dist = float("inf")
-        for i in range(0, len(coords) - 2, 2):
-            d = self.point_segment_dist(mx, my, coords[i], coords[i + 1],
-                                        coords[i + 2], coords[i + 3])
-            if d < best_dist:
-                best_dist = d
-                best_i = i
-        return best_i
-
-    def point_segment_dist(self, px, py, x1, y1, x2, y2):
-        seg_len_sq = (x2 - x1)**2 + (y2 - y1)**2
-        if seg_len_sq == 0:
-            return math.hypot(px - x1, py - y1)
-        t = ((px - x1) * (x2 - x1) + (py - y1) * (y2 - y1)) / seg_len_sq
-        if t < 0:
-            return math.hypot(px - x1, py - y1)
-        if t > 1:
-            return math.hypot(px - x2, py - y2)
-        projx = x1 + t * (x2 - x1)
-        projy = y1 + t * (y2 - y1)
-        return math.hypot(px - projx, py - projy)
+        if len(coords) < 4:
+            return None
+        if NUMBA_AVAILABLE:
+            return _closest_segment_jit(np.frombuffer(coords, dtype=coords.typecode), float(mx), float(my))[0]
+        if NUMPY_AVAILABLE:
+            pts = np.frombuffer(coords, dtype=coords.typecode)
+            return _closest_segment_np(pts[0::2], pts[1::2], mx, my)
+        return _closest_segment(coords, mx, my)[0]
 
 if __name__ == "__main__":
     root = tk.Tk()